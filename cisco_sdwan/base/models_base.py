@@ -7,18 +7,115 @@
 import json
 import re
 from pathlib import Path
-from itertools import zip_longest
+from functools import lru_cache
 from operator import itemgetter
 from collections import namedtuple
 from typing import Sequence, Dict, Tuple
 from .rest_api import RestAPIException
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+else:
+    # Older orjson releases lack options used by json_dumps, or raise errors not handled as json.JSONDecodeError
+    if not (hasattr(orjson, 'OPT_INDENT_2') and hasattr(orjson, 'OPT_NON_STR_KEYS') and
+            issubclass(getattr(orjson, 'JSONDecodeError', type(None)), json.JSONDecodeError)):
+        orjson = None
+
 
 # Top-level directory for local data store
 DATA_DIR = 'data'
 
+# Absolute paths of directories already created by save operations, so that mkdir is only called once per directory
+_mkdir_cache = set()
+
+# Matches vManage item ids (UUIDs)
+_UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+# Matches chars that are not filename safe
+_UNSAFE_RE = re.compile(r'[^\w\s-]')
+
+
+def json_dumps(data, indent=False):
+    """
+    Serialize data to JSON. Uses orjson when available, falling back to the standard library json module otherwise.
+    Both backends use the same format: non-ASCII chars are not escaped and no whitespace is added when indent is False.
+    Remaining differences are that exponent notation differs on large/small floats (1e20 vs. 1e+20, same value once
+    parsed) and that orjson writes NaN/Infinity as null and rejects integers wider than 64 bits.
+    :param data: Object to be serialized
+    :param indent: If True, output is pretty-printed with an indent level of 2
+    :return: bytes containing the UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2 if indent else orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, option=option)
+
+    if indent:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode()
+
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def json_loads(raw_data):
+    """
+    Deserialize a JSON document. Uses orjson when available, falling back to the standard library json module otherwise.
+    Both raise a json.JSONDecodeError (or subclass) on invalid input.
+    :param raw_data: bytes or str containing the JSON document
+    :return: Deserialized object
+    """
+    if orjson is not None:
+        return orjson.loads(raw_data)
+
+    return json.loads(raw_data)
+
+
+def _ensure_dir(dir_path):
+    """
+    Create dir_path, including any missing parents, if not yet done by this process
+    :param dir_path: Path of the directory to create
+    """
+    # Cache is keyed on absolute paths so that entries remain valid if the current working directory changes
+    abs_dir_path = dir_path.absolute()
+    if abs_dir_path not in _mkdir_cache:
+        abs_dir_path.mkdir(parents=True, exist_ok=True)
+        _mkdir_cache.add(abs_dir_path)
+
+
+def clear_dir_cache(dir_path):
+    """
+    Remove dir_path and any directories under it from the cache of directories created by save operations. Needs to be
+    called when those directories are moved or deleted.
+    :param dir_path: str or Path of the directory
+    """
+    target_parts = Path(dir_path).absolute().parts
+    for cached_path in [path for path in _mkdir_cache if path.parts[:len(target_parts)] == target_parts]:
+        _mkdir_cache.discard(cached_path)
+
+
+@lru_cache(maxsize=None)
+def _dir_path(*path_entries):
+    """
+    Return a Path built from path_entries. Paths are cached since the same directories are used for all items of a
+    given type.
+    :param path_entries: str or Path entries composing the path
+    :return: Path object
+    """
+    return Path(*path_entries)
+
+
+def _to_json(data, indent=False):
+    """
+    Serialize data to a JSON str, used for string representations of items
+    :param data: Object to be serialized
+    :param indent: If True, output is pretty-printed with an indent level of 2
+    :return: str containing the JSON document
+    """
+    return json_dumps(data, indent=indent).decode()
+
 
 class UpdateEval:
+    __slots__ = ('is_policy', 'is_master', 'data')
+
     def __init__(self, data):
         self.is_policy = isinstance(data, list)
         # Master template updates (PUT requests) return a dict containing 'data' key. Non-master templates don't.
@@ -39,10 +136,10 @@ class UpdateEval:
         return iter(self.data.get('masterTemplatesAffected', []))
 
     def __str__(self):
-        return json.dumps(self.data, indent=2)
+        return _to_json(self.data, indent=True)
 
     def __repr__(self):
-        return json.dumps(self.data)
+        return _to_json(self.data)
 
 
 class ApiPath:
@@ -60,8 +157,7 @@ class ApiPath:
         """
         self.get = get
         last_op = other_ops[-1] if other_ops else get
-        for field, value in zip_longest(self.__slots__[1:], other_ops, fillvalue=last_op):
-            setattr(self, field, value)
+        self.post, self.put, self.delete = (*other_ops, last_op, last_op, last_op)[:3]
 
 
 class ApiItem:
@@ -103,10 +199,10 @@ class ApiItem:
         return cls(api.get(cls.api_path.get, *path_entries))
 
     def __str__(self):
-        return json.dumps(self.data, indent=2)
+        return _to_json(self.data, indent=True)
 
     def __repr__(self):
-        return json.dumps(self.data)
+        return _to_json(self.data)
 
 
 class IndexApiItem(ApiItem):
@@ -136,10 +232,9 @@ class IndexApiItem(ApiItem):
         None is returned on any fields that are missing in an entry
         :return: The iterator
         """
-        def default_getter(*fields):
-            return lambda row: tuple(row.get(field) for field in fields)
+        fields = (*self.iter_fields, *self.extended_iter_fields)
 
-        return (default_getter(*self.iter_fields, *self.extended_iter_fields)(elem) for elem in self.data)
+        return (tuple(elem.get(field) for field in fields) for elem in self.data)
 
 
 class ConfigItem(ApiItem):
@@ -158,6 +253,16 @@ class ConfigItem(ApiItem):
     skip_cmp_tag_set = set()
     name_check_regex = re.compile(r'(?=^.{1,128}$)[^&<>! "]+$')
 
+    # Keys removed by put_data, post_data and is_equal. Subclass values are computed once by __init_subclass__.
+    _put_skip_tags = frozenset({'@rid', 'createdOn', 'lastUpdatedOn'})
+    _post_skip_tags = _put_skip_tags
+    _cmp_skip_tags = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._post_skip_tags = frozenset({cls.id_tag, *cls._put_skip_tags, *(cls.post_filtered_tags or ())})
+        cls._cmp_skip_tags = frozenset({cls.id_tag, *cls.skip_cmp_tag_set})
+
     def __init__(self, data):
         """
         :param data: dict containing the information to be associated with this configuration item
@@ -165,10 +270,17 @@ class ConfigItem(ApiItem):
         super().__init__(data)
 
     def is_equal(self, other):
-        local_cmp_dict = {k: v for k, v in self.data.items() if k not in self.skip_cmp_tag_set | {self.id_tag}}
-        other_cmp_dict = {k: v for k, v in other.items() if k not in self.skip_cmp_tag_set | {self.id_tag}}
+        """
+        Compare this item's data with other, ignoring id_tag and any keys in skip_cmp_tag_set
+        :param other: dict containing the data to compare against
+        :return: True if both are equal, False otherwise
+        """
+        local_cmp_dict = {k: v for k, v in self.data.items() if k not in self._cmp_skip_tags}
+        other_cmp_dict = {k: v for k, v in other.items() if k not in self._cmp_skip_tags}
 
-        return sorted(json.dumps(local_cmp_dict)) == sorted(json.dumps(other_cmp_dict))
+        # Plain == is a fast way to detect differences. However, it considers 1, 1.0 and True as equal, so a type-aware
+        # comparison is needed to confirm equality.
+        return local_cmp_dict == other_cmp_dict and json_equal(local_cmp_dict, other_cmp_dict)
 
     @property
     def is_readonly(self):
@@ -207,11 +319,13 @@ class ConfigItem(ApiItem):
                              directly under node_dir/store_path
         :return: ConfigItem object, or None if file does not exist and raise_not_found=False
         """
-        dir_path = Path(cls.root_dir, node_dir, *cls.store_path) if use_root_dir else Path(node_dir, *cls.store_path)
+        base_entries = (cls.root_dir, node_dir) if use_root_dir else (node_dir, )
+        dir_path = _dir_path(*base_entries, *cls.store_path)
         file_path = dir_path.joinpath(cls.get_filename(ext_name, item_name, item_id))
         try:
-            with open(file_path, 'r') as read_f:
-                data = json.load(read_f)
+            # Whole file is read at once, an unbuffered read avoids setting up a BufferedReader
+            with open(file_path, 'rb', buffering=0) as read_f:
+                data = json_loads(read_f.read())
         except FileNotFoundError:
             if raise_not_found:
                 has_detail = item_name is not None and item_id is not None
@@ -223,6 +337,18 @@ class ConfigItem(ApiItem):
         else:
             return cls(data)
 
+    def get_save_dir(self, node_dir):
+        """
+        Return the directory where this item is saved, creating it if it doesn't exist yet
+
+        :param node_dir: String indicating directory under root_dir used for all files from a given vManage node.
+        :return: Path of the directory
+        """
+        dir_path = _dir_path(self.root_dir, node_dir, *self.store_path)
+        _ensure_dir(dir_path)
+
+        return dir_path
+
     def save(self, node_dir, ext_name=False, item_name=None, item_id=None):
         """
         Save data (i.e. self.data) to a json file
@@ -237,11 +363,8 @@ class ConfigItem(ApiItem):
         if self.is_empty:
             return False
 
-        dir_path = Path(self.root_dir, node_dir, *self.store_path)
-        dir_path.mkdir(parents=True, exist_ok=True)
-
-        with open(dir_path.joinpath(self.get_filename(ext_name, item_name, item_id)), 'w') as write_f:
-            json.dump(self.data, write_f, indent=2)
+        file_path = self.get_save_dir(node_dir).joinpath(self.get_filename(ext_name, item_name, item_id))
+        file_path.write_bytes(json_dumps(self.data, indent=True))
 
         return True
 
@@ -255,15 +378,7 @@ class ConfigItem(ApiItem):
         :return: Dict containing payload for POST requests
         """
         # Delete keys that shouldn't be on post requests
-        filtered_keys = {
-            self.id_tag,
-            '@rid',
-            'createdOn',
-            'lastUpdatedOn'
-        }
-        if self.post_filtered_tags is not None:
-            filtered_keys.update(self.post_filtered_tags)
-        post_dict = {k: v for k, v in self.data.items() if k not in filtered_keys}
+        post_dict = {k: v for k, v in self.data.items() if k not in self._post_skip_tags}
 
         # Rename item
         if new_name is not None:
@@ -279,12 +394,7 @@ class ConfigItem(ApiItem):
         <new item id>
         :return: Dict containing payload for PUT requests
         """
-        filtered_keys = {
-            '@rid',
-            'createdOn',
-            'lastUpdatedOn'
-        }
-        put_dict = {k: v for k, v in self.data.items() if k not in filtered_keys}
+        put_dict = {k: v for k, v in self.data.items() if k not in self._put_skip_tags}
 
         return update_ids(id_mapping_dict, put_dict)
 
@@ -299,8 +409,20 @@ class ConfigItem(ApiItem):
         }
         filtered_data = {k: v for k, v in self.data.items() if k not in filtered_keys}
 
-        return set(re.findall(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}',
-                              json.dumps(filtered_data)))
+        def ids_in(json_obj):
+            if isinstance(json_obj, dict):
+                for key, value in json_obj.items():
+                    yield from ids_in(key)
+                    yield from ids_in(value)
+
+            elif isinstance(json_obj, list):
+                for elem in json_obj:
+                    yield from ids_in(elem)
+
+            elif isinstance(json_obj, str) and '-' in json_obj:
+                yield from _UUID_RE.findall(json_obj)
+
+        return set(ids_in(filtered_data))
 
     def get_new_name(self, name_template: str) -> Tuple[str, bool]:
         """
@@ -313,7 +435,7 @@ class ConfigItem(ApiItem):
         is_valid = False
 
         try:
-            new_name = ExtendedTemplate(name_template)(self.data[self.name_tag])
+            new_name = _extended_template(name_template)(self.data[self.name_tag])
         except KeyError:
             new_name = None
         else:
@@ -331,22 +453,21 @@ class ConfigItem(ApiItem):
         :return: List
         """
         match_list = []
-
-        def find_in(json_obj):
-            if isinstance(json_obj, dict):
+        # Depth-first traversal, children are pushed in reverse so that matches are returned in document order
+        stack = [self.data if from_key is None else self.data[from_key]]
+        while stack:
+            json_obj = stack.pop()
+            obj_type = type(json_obj)
+            if obj_type is dict:
                 matched_val = json_obj.get(key)
-                if matched_val is not None and not isinstance(matched_val, dict) and not isinstance(matched_val, list):
+                if matched_val is not None and type(matched_val) is not dict and type(matched_val) is not list:
                     match_list.append(matched_val)
-                for value in json_obj.values():
-                    find_in(value)
-
-            elif isinstance(json_obj, list):
-                for elem in json_obj:
-                    find_in(elem)
+                stack.extend(reversed(list(json_obj.values())))
 
-            return match_list
+            elif obj_type is list:
+                stack.extend(reversed(json_obj))
 
-        return find_in(self.data) if from_key is None else find_in(self.data[from_key])
+        return match_list
 
 
 # Used for IndexConfigItem iter_fields when they follow (<item-id-label>, <item-name-label>) format
@@ -367,11 +488,15 @@ class IndexConfigItem(ConfigItem):
         # an evaluation of whether there is collision amongst the filename_safe version of all names in this index.
         # need_extended_name = True indicates that there is collision and that extended names should be used when
         # saving/loading to/from backup
-        if isinstance(self.iter_fields, IdName):
-            filename_safe_set = {filename_safe(item_name, lower=True) for item_name in self.iter(self.iter_fields.name)}
-            self.need_extended_name = len(filename_safe_set) != len(self.data)
-        else:
-            self.need_extended_name = False
+        self.need_extended_name = False
+        if isinstance(self.iter_fields, IdName) and len(self.data) > 1:
+            filename_safe_set = set()
+            for item_name in self.iter(self.iter_fields.name):
+                safe_name = filename_safe(item_name, lower=True)
+                if safe_name in filename_safe_set:
+                    self.need_extended_name = True
+                    break
+                filename_safe_set.add(safe_name)
 
     # Iter_fields should be defined in subclasses and needs to be a tuple subclass.
     # When it follows the format (<item-id>, <item-name>), use an IdName namedtuple instead of regular tuple.
@@ -405,13 +530,14 @@ class IndexConfigItem(ConfigItem):
         None is returned on any fields that are missing in an entry
         :return: The iterator
         """
-        def default_getter(*fields):
-            return lambda row: tuple(row.get(field) for field in fields)
+        fields = (*self.iter_fields, *self.extended_iter_fields)
 
-        return (default_getter(*self.iter_fields, *self.extended_iter_fields)(elem) for elem in self.data)
+        return (tuple(elem.get(field) for field in fields) for elem in self.data)
 
 
 class ServerInfo:
+    __slots__ = ('data', )
+
     root_dir = DATA_DIR
     store_file = 'server_info.json'
 
@@ -436,11 +562,11 @@ class ServerInfo:
         :param node_dir: String indicating directory under root_dir used for all files from a given vManage node.
         :return: ServerInfo object, or None if file does not exist
         """
-        dir_path = Path(cls.root_dir, node_dir)
+        dir_path = _dir_path(cls.root_dir, node_dir)
         file_path = dir_path.joinpath(cls.store_file)
         try:
-            with open(file_path, 'r') as read_f:
-                data = json.load(read_f)
+            with open(file_path, 'rb', buffering=0) as read_f:
+                data = json_loads(read_f.read())
         except FileNotFoundError:
             return None
         except json.decoder.JSONDecodeError as ex:
@@ -455,11 +581,10 @@ class ServerInfo:
         :param node_dir: String indicating directory under root_dir used for all files from a given vManage node.
         :return: True indicates data has been saved. False indicates no data to save (and no file has been created).
         """
-        dir_path = Path(self.root_dir, node_dir)
-        dir_path.mkdir(parents=True, exist_ok=True)
+        dir_path = _dir_path(self.root_dir, node_dir)
+        _ensure_dir(dir_path)
 
-        with open(dir_path.joinpath(self.store_file), 'w') as write_f:
-            json.dump(self.data, write_f, indent=2)
+        dir_path.joinpath(self.store_file).write_bytes(json_dumps(self.data, indent=True))
 
         return True
 
@@ -473,52 +598,113 @@ def filename_safe(name, lower=False):
     :return: string containing the filename-save version of item_name
     """
     # Inspired by Django's slugify function
-    cleaned = re.sub(r'[^\w\s-]', '_', name)
+    cleaned = _UNSAFE_RE.sub('_', name)
     return cleaned.lower() if lower else cleaned
 
 
+def json_equal(left, right):
+    """
+    Compare two JSON-like objects. Unlike ==, values of different types are never equal (e.g. 1, 1.0 and True)
+    :param left: dict, list or scalar value
+    :param right: dict, list or scalar value
+    :return: True if both are equal, False otherwise
+    """
+    if type(left) is not type(right):
+        return False
+
+    if type(left) is dict:
+        return left.keys() == right.keys() and all(json_equal(value, right[key]) for key, value in left.items())
+
+    if type(left) is list:
+        return len(left) == len(right) and all(json_equal(l_elem, r_elem) for l_elem, r_elem in zip(left, right))
+
+    return left == right
+
+
 def update_ids(id_mapping_dict, item_data):
+    """
+    Return a copy of item_data where item ids are replaced as defined in id_mapping_dict. Ids are replaced wherever they
+    appear, including within dict keys and as part of longer strings.
+    :param id_mapping_dict: {<old item id>: <new item id>} dict
+    :param item_data: dict or list containing the data to update
+    :return: Updated copy of item_data, or item_data itself if id_mapping_dict is empty
+    """
+    if not id_mapping_dict:
+        return item_data
+
     def replace_id(match):
         matched_id = match.group(0)
         return id_mapping_dict.get(matched_id, matched_id)
 
-    dict_json = re.sub(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}',
-                       replace_id, json.dumps(item_data))
+    def update_in(json_obj):
+        if isinstance(json_obj, dict):
+            return {update_in(key): update_in(value) for key, value in json_obj.items()}
+
+        if isinstance(json_obj, list):
+            return [update_in(elem) for elem in json_obj]
+
+        if isinstance(json_obj, str) and '-' in json_obj:
+            return _UUID_RE.sub(replace_id, json_obj)
+
+        return json_obj
 
-    return json.loads(dict_json)
+    return update_in(item_data)
 
 
 class ExtendedTemplate:
     template_pattern = re.compile(r'{name(?:\s+(?P<regex>.*?))?\}')
 
     def __init__(self, template):
+        """
+        :param template: str containing the name template. Each {name} variable is replaced with a format label and
+                         its regex (if any) is compiled once, so that the template can be applied to many names.
+        """
         self.src_template = template
-        self.label_value_map = None
+        # List of (<label>, <compiled regex or None>, <regex replacement str or None>) tuples
+        self.label_regex_list = []
 
-    def __call__(self, name):
-        def regex_replace(match_obj):
+        def label_replace(match_obj):
             regex = match_obj.group('regex')
             if regex is not None:
                 regex_p = re.compile(regex)
                 if not regex_p.groups:
                     raise KeyError('regular expression must include at least one capturing group')
 
-                value, regex_p_subs = regex_p.subn(''.join(f'\\{group+1}' for group in range(regex_p.groups)), name)
-                new_value = value if regex_p_subs else ''
+                regex_repl = ''.join(f'\\{group+1}' for group in range(regex_p.groups))
             else:
-                new_value = name
+                regex_p = regex_repl = None
 
-            label = 'name_{count}'.format(count=len(self.label_value_map))
-            self.label_value_map[label] = new_value
+            label = 'name_{count}'.format(count=len(self.label_regex_list))
+            self.label_regex_list.append((label, regex_p, regex_repl))
 
             return f'{{{label}}}'
 
-        self.label_value_map = {}
-        template, name_p_subs = self.template_pattern.subn(regex_replace, self.src_template)
+        self.template, name_p_subs = self.template_pattern.subn(label_replace, template)
         if not name_p_subs:
             raise KeyError('template must include {name} variable')
 
-        return template.format(**self.label_value_map)
+    def __call__(self, name):
+        def name_value(regex_p, regex_repl):
+            if regex_p is None:
+                return name
+
+            value, regex_p_subs = regex_p.subn(regex_repl, name)
+            return value if regex_p_subs else ''
+
+        return self.template.format(**{
+            label: name_value(regex_p, regex_repl) for label, regex_p, regex_repl in self.label_regex_list
+        })
+
+
+@lru_cache(maxsize=None)
+def _extended_template(template):
+    """
+    Return an ExtendedTemplate for template. Instances are cached so that regexes in a template applied to many items
+    are only compiled once.
+    :param template: str containing the name template
+    :return: ExtendedTemplate object
+    """
+    return ExtendedTemplate(template)
 
 
 class ModelException(Exception):
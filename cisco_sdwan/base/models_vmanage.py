@@ -5,7 +5,6 @@
  This module implements vManage API models
 """
 from typing import Iterable, Set
-from pathlib import Path
 from urllib.parse import quote_plus
 from .catalog import register
 from .models_base import ApiItem, IndexApiItem, ConfigItem, IndexConfigItem, ApiPath, IdName
@@ -189,10 +188,8 @@ class DeviceConfig(ConfigItem):
         if self.is_empty:
             return False
 
-        dir_path = Path(self.root_dir, node_dir, *self.store_path)
-        dir_path.mkdir(parents=True, exist_ok=True)
-
-        with open(dir_path.joinpath(self.get_filename(ext_name, item_name, item_id)), 'w') as write_f:
+        file_path = self.get_save_dir(node_dir).joinpath(self.get_filename(ext_name, item_name, item_id))
+        with open(file_path, 'w') as write_f:
             write_f.write(self.data['config'])
 
         return True
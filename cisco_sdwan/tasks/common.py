@@ -13,7 +13,7 @@ from shutil import rmtree
 from itertools import repeat
 from collections import namedtuple
 from cisco_sdwan.base.rest_api import Rest, RestAPIException
-from cisco_sdwan.base.models_base import DATA_DIR
+from cisco_sdwan.base.models_base import DATA_DIR, clear_dir_cache
 from cisco_sdwan.base.models_vmanage import (DeviceTemplate, DeviceTemplateValues, DeviceTemplateAttached,
                                              DeviceTemplateAttach, DeviceTemplateCLIAttach, DeviceModeCli,
                                              ActionStatus, PolicyVsmartStatus, PolicyVsmartStatusException,
@@ -438,11 +438,13 @@ def clean_dir(target_dir_name, max_saved=99):
     """
     target_dir = Path(DATA_DIR, target_dir_name)
     if target_dir.exists():
+        clear_dir_cache(target_dir)
         if max_saved > 0:
             save_seq = range(max_saved)
             for elem in save_seq:
                 save_path = Path(DATA_DIR, '{workdir}_{count}'.format(workdir=target_dir_name, count=elem+1))
                 if elem == save_seq[-1]:
+                    clear_dir_cache(save_path)
                     rmtree(save_path, ignore_errors=True)
                 if not save_path.exists():
                     target_dir.rename(save_path)
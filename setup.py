@@ -27,6 +27,9 @@ setuptools.setup(
     install_requires=[
        'requests',
     ],
+    extras_require={
+        'orjson': ['orjson>=3.4'],
+    },
     entry_points={
         'console_scripts': [
             'sdwan=cisco_sdwan.cmd:main',
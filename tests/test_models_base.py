@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from cisco_sdwan.base.models_base import ConfigItem, json_equal
+from cisco_sdwan.tasks.common import clean_dir
+
+
+class CmpItem(ConfigItem):
+    id_tag = 'templateId'
+    name_tag = 'templateName'
+    skip_cmp_tag_set = {'lastUpdatedOn'}
+    store_path = ('test_items', )
+    store_file = '{item_name}.json'
+
+
+class TestIsEqual(unittest.TestCase):
+    def test_equal_ignores_skipped_tags(self):
+        item = CmpItem({'templateId': 'a', 'templateName': 'n', 'lastUpdatedOn': 1, 'value': [1, {'x': 'y'}]})
+        self.assertTrue(item.is_equal({'templateId': 'b', 'templateName': 'n', 'lastUpdatedOn': 2,
+                                       'value': [1, {'x': 'y'}]}))
+
+    def test_not_equal(self):
+        item = CmpItem({'templateName': 'n', 'value': [1, 2]})
+        self.assertFalse(item.is_equal({'templateName': 'n', 'value': [2, 1]}))
+        self.assertFalse(item.is_equal({'templateName': 'n', 'value': [1, 2], 'extra': None}))
+
+    def test_bool_int_float_are_different(self):
+        item = CmpItem({'vipValue': 1})
+        self.assertFalse(item.is_equal({'vipValue': True}))
+        self.assertFalse(item.is_equal({'vipValue': 1.0}))
+        self.assertFalse(CmpItem({'vipValue': False}).is_equal({'vipValue': 0}))
+        self.assertFalse(CmpItem({'v': {'x': [0]}}).is_equal({'v': {'x': [False]}}))
+        self.assertTrue(item.is_equal({'vipValue': 1}))
+
+    def test_json_equal(self):
+        self.assertTrue(json_equal({'a': [1, 'b', None]}, {'a': [1, 'b', None]}))
+        self.assertFalse(json_equal([1], (1, )))
+        self.assertFalse(json_equal({'a': 1}, {'b': 1}))
+
+
+class TestSave(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_save_after_clean_dir(self):
+        item = CmpItem({'templateId': 'a', 'templateName': 'n'})
+        for max_saved in (0, 99, 0):
+            self.assertTrue(item.save('node', item_name='n', item_id='a'))
+            self.assertEqual(CmpItem.load('node', item_name='n', item_id='a').data, item.data)
+            clean_dir('node', max_saved=max_saved)
+            self.assertIsNone(CmpItem.load('node', item_name='n', item_id='a'))
+
+    def test_save_after_chdir(self):
+        item = CmpItem({'templateId': 'a', 'templateName': 'n'})
+        self.assertTrue(item.save('node', item_name='n', item_id='a'))
+        with tempfile.TemporaryDirectory() as other_dir:
+            os.chdir(other_dir)
+            self.assertTrue(item.save('node', item_name='n', item_id='a'))
+            self.assertEqual(CmpItem.load('node', item_name='n', item_id='a').data, item.data)
+            os.chdir(self.tmp_dir.name)
+
+
+if __name__ == '__main__':
+    unittest.main()